@@ -1,149 +1,646 @@
 import json
+import mmap
 import os
+import pickle
+import re
+import sys
 import argparse
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
+
+#orjson is optional, fall back to the standard library when it is missing
+try:
+    import orjson
+
+    def _dumps(obj: Any, pretty: bool = False) -> bytes:
+        """Serialize obj to compact, or indented if pretty, JSON bytes."""
+        #recipes go through to_dict so their extra keys stay at the top level
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option, default=Recipe.to_dict)
+
+    _loads = orjson.loads
+    #whether _loads can parse a memoryview of a memory mapped file
+    _LOADS_BUFFER = True
+except ImportError:
+    def _dumps(obj: Any, pretty: bool = False) -> bytes:
+        """Serialize obj to compact, or indented if pretty, JSON bytes."""
+        if pretty:
+            return json.dumps(obj, indent=2, ensure_ascii=False,
+                              default=Recipe.to_dict).encode('utf-8')
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False,
+                          default=Recipe.to_dict).encode('utf-8')
+
+    _loads = json.loads
+    _LOADS_BUFFER = False
+
+#simdjson is optional, used to parse lazily for read-only commands
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+
+@dataclass(slots=True)
+class Recipe:
+    """A single recipe."""
+    id: int
+    name: str
+    ingredients: List[str]
+    instructions: List[str]
+    prep_time: int
+    cook_time: int
+    servings: int
+    tags: List[str]
+    date_added: str
+    #keys this version does not know about, kept so they are written back
+    extras: Dict[str, Any] = field(default_factory=dict)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Recipe":
+        """Build a recipe from a JSON dict.
+
+        Raises KeyError if a field is missing and TypeError if one has the wrong type.
+        """
+        for name in _RECIPE_FIELDS:
+            _check_field(name, data[name])
+        recipe = cls(**{name: data[name] for name in _RECIPE_FIELDS})
+        if len(data) > len(_RECIPE_FIELDS):
+            recipe.extras = {key: value for key, value in data.items() if key not in _RECIPE_FIELDS}
+        return recipe
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the recipe as a plain dict for JSON encoding."""
+        data = {name: getattr(self, name) for name in _RECIPE_FIELDS}
+        data.update(self.extras)
+        return data
+
+
+_RECIPE_FIELDS = tuple(name for name in Recipe.__slots__ if name != 'extras')
+
+#JSON type of each recipe field, lists hold strings
+_FIELD_TYPES = {
+    'id': int,
+    'name': str,
+    'ingredients': list,
+    'instructions': list,
+    'prep_time': int,
+    'cook_time': int,
+    'servings': int,
+    'tags': list,
+    'date_added': str,
+}
+
+
+def _check_field(name: str, value: Any) -> None:
+    """Raise TypeError if value is not valid for the recipe field name."""
+    expected = _FIELD_TYPES[name]
+    #bool is an int subclass but never a valid number of minutes
+    if not isinstance(value, expected) or isinstance(value, bool):
+        raise TypeError(f"{name} must be {expected.__name__}, not {type(value).__name__}")
+    if expected is list and not all(isinstance(item, str) for item in value):
+        raise TypeError(f"{name} must be a list of strings")
+
+
+#joins the searched fields so one substring test covers all of them
+_SEP = "\x1f"
+
+
+def _haystack(name: str, ingredients: List[str], tags: List[str]) -> bytes:
+    """Return the casefolded name, tags and ingredients joined and encoded as UTF-8 bytes."""
+    return _SEP.join([name, *tags, *ingredients]).casefold().encode('utf-8', 'surrogatepass')
+
+
+#editable fields and how their command line values are converted
+_EDIT_COERCE = {
+    'name': " ".join,
+    'ingredients': list,
+    'instructions': list,
+    'prep_time': lambda values: int(values[0]),
+    'cook_time': lambda values: int(values[0]),
+    'servings': lambda values: int(values[0]),
+    'tags': list,
+}
+
+#files at least this large are memory mapped instead of read
+_MMAP_THRESHOLD = 64 * 1024
+
+#manager state kept in the cache file, everything the loader builds
+_CACHED_STATE = ('recipes', '_by_id', '_pos', '_next_id', '_names_ci', '_haystack',
+                 '_tok_index', '_tombstones', '_journal_len', '_journal_ok')
+#bump when the layout of the cached state changes
+_CACHE_VERSION = 1
+
+_WORD = re.compile(r"\w+")
+
+
+def _search_tokens(recipe: Recipe) -> set:
+    """Return the casefolded words of a recipe's name, ingredients and tags."""
+    tokens = set(_WORD.findall(recipe.name.casefold()))
+    for text in recipe.ingredients + recipe.tags:
+        tokens.update(_WORD.findall(text.casefold()))
+    return tokens
+
 
 class RecipeManager:
     """Recipe manager that handles saving, loading, and manipulating recipes."""
     
-    def __init__(self, file_path: str = "recipes.json"):
-        """Initialize with the path to the recipe file."""
+    def __init__(self, file_path: str = "recipes.json", readonly: bool = False,
+                 pretty: bool = False, lazy: bool = False):
+        """Initialize with the path to the recipe file.
+
+        Changes are appended to a journal next to the recipe file (recipes.jsonl
+        for recipes.json) and folded back into it by compact().
+
+        The loaded recipes and indexes are cached in a pickle file next to the
+        recipe file (recipes.json.idx) and reused while neither file changes.
+        Every change makes the cache stale, so only readonly managers write it
+        after a full load; a manager that writes never pays for pickling. A
+        readonly manager refuses to change recipes.
+
+        A fresh cache always wins. Without one, a lazy manager, which must be
+        readonly, parses the file with simdjson when it is installed and only
+        materializes the recipes it returns, which suits a single lookup but
+        leaves the cache stale. Listing
+        and searching fall back to the full loader, which renumbers duplicate
+        IDs. The recipe file is written compactly unless pretty is set, in
+        which case every change rewrites it indented instead of being journaled.
+        """
+        if lazy and not readonly:
+            raise ValueError("lazy requires readonly")
+        
         self.file_path = file_path
+        self.pretty = pretty
+        self.journal_path = os.path.splitext(file_path)[0] + ".jsonl"
+        self.cache_path = file_path + ".idx"
+        self.readonly = readonly
+        self._parser = None
+        self._document = None
+        self.recipes = None
+        self._tombstones = 0
+        #cleared when the recipe file cannot be read, so it is never overwritten
+        self._writable = True
+        
+        cache_key = self._cache_key()
+        if self._load_cache(cache_key):
+            return
+        
+        if lazy:
+            self._document = self._load_recipes_readonly()
+        if self._document is None:
+            self._load_all(cache_key if self.readonly else None)
+    
+    def _load_all(self, cache_key: Optional[tuple]) -> None:
+        """Load every recipe, build the indexes and replay the journal.
+
+        The result is cached under cache_key unless it is None.
+        """
         self.recipes = self._load_recipes()
+        self._build_index()
+        renumbered = len(self._by_id) < len(self.recipes)
+        if renumbered:
+            self._renumber_duplicates()
+            self._build_index()
+        self._replay_journal()
+        if renumbered:
+            #the next change rewrites the recipe file with the new IDs
+            self._journal_ok = False
+        if self._tombstones > len(self.recipes) // 4:
+            self._drop_tombstones()
+        if self._writable:
+            self._save_cache(cache_key)
+    
+    def _drop_document(self) -> None:
+        """Fall back from the lazy document to the full loader, which reports bad recipes."""
+        self._document = None
+        self._parser = None
+        self._load_all(self._cache_key() if self.readonly else None)
     
-    def _load_recipes(self) -> List[Dict[str, Any]]:
+    def _cache_key(self) -> Optional[tuple]:
+        """Return the stat signature of the recipe file and journal, or None if neither exists."""
+        key = []
+        for path in (self.file_path, self.journal_path):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                key.append(None)
+            else:
+                key.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return tuple(key) if any(key) else None
+    
+    def _load_cache(self, cache_key: Optional[tuple]) -> bool:
+        """Restore the loaded state from the cache file if it matches cache_key."""
+        if cache_key is None:
+            return False
+        
+        try:
+            with open(self.cache_path, 'rb') as file:
+                cached_key, state = pickle.load(file)
+            if cached_key != (_CACHE_VERSION, cache_key) or state.keys() != set(_CACHED_STATE):
+                return False
+        except FileNotFoundError:
+            return False
+        except (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError,
+                pickle.UnpicklingError):
+            #unreadable, written by another version or not a cache at all, rebuild it
+            return False
+        
+        for name in _CACHED_STATE:
+            setattr(self, name, state[name])
+        return True
+    
+    def _save_cache(self, cache_key: Optional[tuple]) -> None:
+        """Write the loaded state to the cache file under cache_key."""
+        if cache_key is None:
+            return
+        
+        state = {name: getattr(self, name) for name in _CACHED_STATE}
+        temp_path = self.cache_path + ".tmp"
+        try:
+            with open(temp_path, 'wb') as file:
+                pickle.dump(((_CACHE_VERSION, cache_key), state), file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            #the cache is only an optimization
+            pass
+    
+    def _load_recipes(self) -> List[Recipe]:
         """Load recipes from the JSON file."""
         if not os.path.exists(self.file_path):
             return []
         
         try:
-            with open(self.file_path, 'r') as file:
-                return json.load(file)
-        except json.JSONDecodeError:
-            print(f"Error reading {self.file_path}. Starting with empty recipe list.")
+            recipes = self._parse_file(_loads, _LOADS_BUFFER)
+            return [Recipe.from_dict(recipe) for recipe in recipes]
+        except (ValueError, KeyError, TypeError):
+            #ValueError covers JSONDecodeError and undecodable UTF-8
+            print(f"Error reading {self.file_path}. Changes will not be saved until it is fixed.")
+            self._writable = False
             return []
     
+    def _check_writable(self) -> bool:
+        """Return whether the recipe file may be written, printing why not."""
+        if self.readonly:
+            print(f"Error: {self.file_path} was opened read-only, refusing to change it.")
+            return False
+        if not self._writable:
+            print(f"Error: {self.file_path} could not be read, refusing to overwrite it.")
+        return self._writable
+    
+    def _parse_file(self, parse: Callable[[Any], Any], buffer: bool) -> Any:
+        """Parse the recipe file, memory mapping it if large and parse accepts a buffer."""
+        with open(self.file_path, 'rb') as file:
+            if not buffer or os.fstat(file.fileno()).st_size < _MMAP_THRESHOLD:
+                return parse(file.read())
+            
+            #hand the parser the page cache instead of a copy of the file
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return parse(view)
+    
+    def _load_recipes_readonly(self) -> Any:
+        """Parse the JSON file lazily with simdjson, or return None if not possible."""
+        if simdjson is None or not os.path.exists(self.file_path):
+            return None
+        #pending journal changes need the regular loader
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path):
+            return None
+        
+        #the document is only valid while its parser is alive
+        self._parser = simdjson.Parser()
+        try:
+            document = self._parse_file(self._parser.parse, True)
+        except (ValueError, RuntimeError):
+            #let the regular loader report the error
+            return None
+        
+        if not isinstance(document, simdjson.Array):
+            return None
+        return document
+    
+    def _build_index(self) -> None:
+        """Index the loaded recipes by ID and by position in the list."""
+        self._by_id = {recipe.id: recipe for recipe in self.recipes}
+        self._pos = {recipe.id: i for i, recipe in enumerate(self.recipes)}
+        self._next_id = max(self._by_id, default=0) + 1
+        self._names_ci = {recipe.name.casefold() for recipe in self.recipes}
+        #casefolded UTF-8 search text, parallel to self.recipes
+        self._haystack = [_haystack(recipe.name, recipe.ingredients, recipe.tags)
+                          for recipe in self.recipes]
+        #deleted recipes are left as None until the list is compacted
+        self._tombstones = 0
+        #inverted index of search words to recipe IDs
+        self._tok_index = {}
+        for recipe in self.recipes:
+            self._index_tokens(recipe)
+    
+    def _renumber_duplicates(self) -> None:
+        """Give each recipe that repeats an earlier recipe's ID the next free ID.
+
+        Older versions numbered new recipes by count, so a delete followed by
+        an add could reuse an ID. The first recipe keeps it, as that is the
+        one they found by ID.
+        """
+        seen = set()
+        next_id = self._next_id
+        for recipe in self.recipes:
+            if recipe.id in seen:
+                print(f"Recipe '{recipe.name}' shares ID {recipe.id} with another recipe, "
+                      f"it now has ID {next_id}.")
+                recipe.id = next_id
+                next_id += 1
+            seen.add(recipe.id)
+    
+    def _index_tokens(self, recipe: Recipe) -> None:
+        """Add a recipe's search words to the inverted index."""
+        for token in _search_tokens(recipe):
+            self._tok_index.setdefault(token, set()).add(recipe.id)
+    
+    def _unindex_tokens(self, recipe: Recipe) -> None:
+        """Remove a recipe's search words from the inverted index."""
+        for token in _search_tokens(recipe):
+            ids = self._tok_index[token]
+            ids.discard(recipe.id)
+            if not ids:
+                del self._tok_index[token]
+    
+    def _replay_journal(self) -> None:
+        """Apply the changes logged in the journal since the last compaction."""
+        self._journal_len = 0
+        self._journal_ok = True
+        if not os.path.exists(self.journal_path):
+            return
+        
+        with open(self.journal_path, 'rb') as file:
+            for line in file:
+                try:
+                    self._apply_change(_loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    #a torn write or malformed change, the next change compacts it away
+                    #ValueError covers JSONDecodeError and undecodable UTF-8
+                    print(f"Error reading {self.journal_path}. Ignoring changes after line {self._journal_len}.")
+                    self._journal_ok = False
+                    return
+                self._journal_len += 1
+    
+    def _apply_change(self, change: Dict[str, Any]) -> None:
+        """Apply one journal change.
+
+        Raises KeyError or TypeError if it is malformed, before anything is changed.
+        """
+        if change['op'] == 'add':
+            self._apply_add(Recipe.from_dict(change['recipe']))
+        elif change['op'] == 'edit':
+            if change['field'] not in _EDIT_COERCE:
+                raise KeyError(change['field'])
+            _check_field(change['field'], change['value'])
+            self._apply_edit(change['id'], change['field'], change['value'])
+        elif change['op'] == 'delete':
+            self._apply_delete(change['id'])
+        else:
+            raise KeyError(change['op'])
+    
+    def _log_change(self, change: Dict[str, Any]) -> None:
+        """Append a change to the journal, compacting when it grows too long."""
+        #a pretty manager rewrites the indented recipe file on every change
+        rewrite = self.pretty or not self._journal_ok
+        if not rewrite:
+            with open(self.journal_path, 'ab') as file:
+                file.write(_dumps(change) + b"\n")
+                file.flush()
+                os.fsync(file.fileno())
+            self._journal_len += 1
+        
+        if rewrite or self._journal_len > 2 * len(self._by_id):
+            self.compact()
+    
     def _save_recipes(self) -> None:
-        """Save recipes to the JSON file."""
-        with open(self.file_path, 'w') as file:
-            json.dump(self.recipes, file, indent=2)
+        """Save recipes to the JSON file, replacing it atomically."""
+        if self._tombstones > len(self.recipes) // 4:
+            self._drop_tombstones()
+        
+        temp_path = self.file_path + ".tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(_dumps(self.list_recipes(), self.pretty))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.file_path)
+    
+    def compact(self) -> None:
+        """Fold the journal into the recipe file and start a new journal."""
+        if not self._check_writable():
+            return
+        self._save_recipes()
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_len = 0
+        self._journal_ok = True
+    
+    def _apply_add(self, recipe: Recipe) -> None:
+        """Add a recipe to the collection and its indexes."""
+        #replaying a journal that was already compacted
+        if recipe.id in self._by_id:
+            return
+        
+        self._by_id[recipe.id] = recipe
+        self._pos[recipe.id] = len(self.recipes)
+        self._next_id = max(self._next_id, recipe.id + 1)
+        self._names_ci.add(recipe.name.casefold())
+        self.recipes.append(recipe)
+        self._haystack.append(_haystack(recipe.name, recipe.ingredients, recipe.tags))
+        self._index_tokens(recipe)
+    
+    def _apply_edit(self, recipe_id: int, field: str, value: Any) -> None:
+        """Set a field of a recipe and update its indexes."""
+        recipe = self._by_id.get(recipe_id)
+        if recipe is None:
+            return
+        
+        if field == 'name':
+            new_name = value.casefold()
+            self._names_ci.discard(recipe.name.casefold())
+            self._names_ci.add(new_name)
+        
+        searchable = field in ('name', 'ingredients', 'tags')
+        if searchable:
+            self._unindex_tokens(recipe)
+        setattr(recipe, field, value)
+        if searchable:
+            self._haystack[self._pos[recipe_id]] = _haystack(recipe.name, recipe.ingredients, recipe.tags)
+            self._index_tokens(recipe)
+    
+    def _apply_delete(self, recipe_id: int) -> Optional[Recipe]:
+        """Remove a recipe from the collection and its indexes."""
+        i = self._pos.pop(recipe_id, None)
+        if i is None:
+            return None
+        
+        #leave a tombstone instead of shifting the recipes after it
+        deleted = self.recipes[i]
+        self.recipes[i] = None
+        self._haystack[i] = b""
+        self._tombstones += 1
+        del self._by_id[recipe_id]
+        self._names_ci.discard(deleted.name.casefold())
+        self._unindex_tokens(deleted)
+        return deleted
+    
+    def _drop_tombstones(self) -> None:
+        """Remove the slots of deleted recipes and renumber the positions."""
+        live = [i for i, recipe in enumerate(self.recipes) if recipe is not None]
+        self.recipes = [self.recipes[i] for i in live]
+        self._haystack = [self._haystack[i] for i in live]
+        self._pos = {recipe.id: i for i, recipe in enumerate(self.recipes)}
+        self._tombstones = 0
     
     def add_recipe(self, name: str, ingredients: List[str], instructions: List[str], 
                   prep_time: int, cook_time: int, servings: int, tags: List[str]) -> None:
         """Add a new recipe to the collection."""
+        if not self._check_writable():
+            return
+        
         #check if recipe with this name already exists
-        if any(recipe['name'].lower() == name.lower() for recipe in self.recipes):
+        if name.casefold() in self._names_ci:
             print(f"Recipe '{name}' already exists. Use edit command to modify it.")
             return
         
-        recipe = {
-            'id': len(self.recipes) + 1,
-            'name': name,
-            'ingredients': ingredients,
-            'instructions': instructions,
-            'prep_time': prep_time,
-            'cook_time': cook_time,
-            'servings': servings,
-            'tags': tags,
-            'date_added': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        recipe = Recipe(
+            id=self._next_id,
+            name=name,
+            ingredients=ingredients,
+            instructions=instructions,
+            prep_time=prep_time,
+            cook_time=cook_time,
+            servings=servings,
+            tags=tags,
+            date_added=datetime.now().isoformat(sep=' ', timespec='seconds')
+        )
         
-        self.recipes.append(recipe)
-        self._save_recipes()
+        self._apply_add(recipe)
+        self._log_change({'op': 'add', 'recipe': recipe})
         print(f"Recipe '{name}' added successfully!")
     
     def edit_recipe(self, recipe_id: int, field: str, value: Any) -> bool:
         """Edit a specific field of a recipe."""
-        for recipe in self.recipes:
-            if recipe['id'] == recipe_id:
-                if field in recipe:
-                    recipe[field] = value
-                    self._save_recipes()
-                    print(f"Updated {field} for recipe '{recipe['name']}'")
-                    return True
-                else:
-                    print(f"Field '{field}' does not exist in recipe.")
-                    return False
-        
-        print(f"Recipe with ID {recipe_id} not found.")
-        return False
+        if not self._check_writable():
+            return False
+        
+        recipe = self._by_id.get(recipe_id)
+        if recipe is None:
+            print(f"Recipe with ID {recipe_id} not found.")
+            return False
+        
+        if field not in _EDIT_COERCE:
+            print(f"Field '{field}' cannot be edited.")
+            return False
+        
+        if field == 'name':
+            old_name, new_name = recipe.name.casefold(), value.casefold()
+            if new_name != old_name and new_name in self._names_ci:
+                print(f"Recipe '{value}' already exists.")
+                return False
+        
+        self._apply_edit(recipe_id, field, value)
+        self._log_change({'op': 'edit', 'id': recipe_id, 'field': field, 'value': value})
+        print(f"Updated {field} for recipe '{recipe.name}'")
+        return True
     
     def delete_recipe(self, recipe_id: int) -> bool:
         """Delete a recipe by ID."""
-        for i, recipe in enumerate(self.recipes):
-            if recipe['id'] == recipe_id:
-                deleted = self.recipes.pop(i)
-                self._save_recipes()
-                print(f"Recipe '{deleted['name']}' deleted successfully!")
-                return True
+        if not self._check_writable():
+            return False
+        
+        deleted = self._apply_delete(recipe_id)
+        if deleted is None:
+            print(f"Recipe with ID {recipe_id} not found.")
+            return False
         
-        print(f"Recipe with ID {recipe_id} not found.")
-        return False
+        self._log_change({'op': 'delete', 'id': recipe_id})
+        print(f"Recipe '{deleted.name}' deleted successfully!")
+        return True
     
-    def search_recipes(self, query: str) -> List[Dict[str, Any]]:
+    def search_recipes(self, query: str) -> List[Recipe]:
         """Search for recipes by name, ingredients, or tags."""
-        query = query.lower()
-        results = []
+        query = query.casefold()
+        if self._document is not None:
+            #duplicate IDs are only renumbered by the full loader
+            self._drop_document()
         
-        for recipe in self.recipes:
-            #search in name
-            if query in recipe['name'].lower():
-                results.append(recipe)
-                continue
-            
-            #search in ingredients
-            if any(query in ingredient.lower() for ingredient in recipe['ingredients']):
-                results.append(recipe)
-                continue
-            
-            #search in tags
-            if any(query in tag.lower() for tag in recipe['tags']):
-                results.append(recipe)
-                continue
+        if _WORD.fullmatch(query):
+            #a single word can only match inside one indexed word
+            ids = set()
+            for token, token_ids in self._tok_index.items():
+                if query in token:
+                    ids |= token_ids
+            #skip IDs whose recipe is gone, the index only has to narrow the scan
+            positions = sorted(i for i in map(self._pos.get, ids) if i is not None)
+            return [self.recipes[i] for i in positions if self.recipes[i] is not None]
         
-        return results
+        #one bytes substring test covers the name, tags and ingredients
+        needle = query.encode('utf-8', 'surrogatepass')
+        return [recipe for recipe, haystack in zip(self.recipes, self._haystack)
+                if recipe is not None and needle in haystack]
     
-    def list_recipes(self) -> List[Dict[str, Any]]:
+    def list_recipes(self) -> List[Recipe]:
         """List all recipes."""
+        if self._document is not None:
+            #duplicate IDs are only renumbered by the full loader
+            self._drop_document()
+        if self._tombstones:
+            return [recipe for recipe in self.recipes if recipe is not None]
         return self.recipes
     
-    def get_recipe(self, recipe_id: int) -> Optional[Dict[str, Any]]:
+    def get_recipe(self, recipe_id: int) -> Optional[Recipe]:
         """Get a recipe by ID."""
-        for recipe in self.recipes:
-            if recipe['id'] == recipe_id:
-                return recipe
-        return None
+        if self._document is not None:
+            try:
+                #only the matching recipe is decoded
+                for recipe in self._document:
+                    if recipe['id'] == recipe_id:
+                        return Recipe.from_dict(recipe.as_dict())
+            except (KeyError, TypeError):
+                pass
+            #a miss may be a duplicate ID the full loader renumbers
+            self._drop_document()
+        
+        return self._by_id.get(recipe_id)
 
 
-def display_recipe(recipe: Dict[str, Any]) -> None:
-    """Display a recipe in a readable format."""
-    print("\n" + "=" * 50)
-    print(f"Recipe #{recipe['id']}: {recipe['name']}")
-    print("=" * 50)
-    
-    print(f"\nPrep Time: {recipe['prep_time']} minutes")
-    print(f"Cook Time: {recipe['cook_time']} minutes")
-    print(f"Servings: {recipe['servings']}")
+_RULE = "=" * 50
+
+
+def format_recipe(recipe: Recipe) -> str:
+    """Format a recipe in a readable format."""
+    parts = [
+        f"\n{_RULE}\nRecipe #{recipe.id}: {recipe.name}\n{_RULE}\n",
+        f"\nPrep Time: {recipe.prep_time} minutes\n",
+        f"Cook Time: {recipe.cook_time} minutes\n",
+        f"Servings: {recipe.servings}\n",
+    ]
     
-    print("\nIngredients:")
-    for i, ingredient in enumerate(recipe['ingredients'], 1):
-        print(f"  {i}. {ingredient}")
+    parts.append("\nIngredients:\n")
+    parts.extend(f"  {i}. {ingredient}\n" for i, ingredient in enumerate(recipe.ingredients, 1))
     
-    print("\nInstructions:")
-    for i, instruction in enumerate(recipe['instructions'], 1):
-        print(f"  {i}. {instruction}")
+    parts.append("\nInstructions:\n")
+    parts.extend(f"  {i}. {instruction}\n" for i, instruction in enumerate(recipe.instructions, 1))
     
-    if recipe['tags']:
-        print(f"\nTags: {', '.join(recipe['tags'])}")
+    if recipe.tags:
+        parts.append(f"\nTags: {', '.join(recipe.tags)}\n")
     
-    print(f"\nAdded on: {recipe['date_added']}")
-    print("=" * 50 + "\n")
+    parts.append(f"\nAdded on: {recipe.date_added}\n{_RULE}\n\n")
+    return "".join(parts)
+
+
+def display_recipe(recipe: Recipe) -> None:
+    """Display a recipe in a readable format."""
+    sys.stdout.write(format_recipe(recipe))
 
 
 def main():
     """Main function to handle command line arguments and control the program flow."""
     parser = argparse.ArgumentParser(description="Recipe Manager - Manage your recipes from the command line")
+    parser.add_argument("--pretty", action="store_true", help="Rewrite the recipe file indented when a recipe changes")
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
     
     #add
@@ -161,14 +658,13 @@ def main():
     list_parser.add_argument("--compact", action="store_true", help="Show compact list (IDs and names only)")
     
     #view
-    view_parser = subparsers.add_parser("view", help="View a specific recipe")
-    view_parser.add_argument("id", type=int, help="Recipe ID to view")
+    view_parser = subparsers.add_parser("view", help="View specific recipes")
+    view_parser.add_argument("id", type=int, nargs="+", help="Recipe IDs to view")
     
     #edit recipe command
     edit_parser = subparsers.add_parser("edit", help="Edit a recipe")
     edit_parser.add_argument("id", type=int, help="Recipe ID to edit")
-    edit_parser.add_argument("--field", required=True, choices=["name", "ingredients", "instructions", 
-                                                              "prep_time", "cook_time", "servings", "tags"],
+    edit_parser.add_argument("--field", required=True, choices=list(_EDIT_COERCE),
                            help="Field to edit")
     edit_parser.add_argument("--value", required=True, nargs="+", help="New value for the field")
     
@@ -183,12 +679,9 @@ def main():
     #parse arguments
     args = parser.parse_args()
     
-    #initialize
-    manager = RecipeManager()
-    
-    #process all commands
+    #process all commands, the recipes are only loaded once they are needed
     if args.command == "add":
-        manager.add_recipe(
+        RecipeManager(pretty=args.pretty).add_recipe(
             name=args.name,
             ingredients=args.ingredients,
             instructions=args.instructions,
@@ -199,51 +692,46 @@ def main():
         )
     
     elif args.command == "list":
-        recipes = manager.list_recipes()
+        recipes = RecipeManager(readonly=True).list_recipes()
         if not recipes:
             print("No recipes found.")
         elif args.compact:
             print("\nRecipes:")
-            for recipe in recipes:
-                print(f"#{recipe['id']}: {recipe['name']}")
+            sys.stdout.write("".join(f"#{recipe.id}: {recipe.name}\n" for recipe in recipes))
         else:
-            for recipe in recipes:
-                display_recipe(recipe)
+            #one write for the whole list
+            sys.stdout.write("".join(format_recipe(recipe) for recipe in recipes))
     
     elif args.command == "view":
-        recipe = manager.get_recipe(args.id)
-        if recipe:
-            display_recipe(recipe)
-        else:
-            print(f"Recipe with ID {args.id} not found.")
+        #the lazy loader scans for each ID, the ID index pays off for several
+        manager = RecipeManager(readonly=True, lazy=len(args.id) == 1)
+        for recipe_id in args.id:
+            recipe = manager.get_recipe(recipe_id)
+            if recipe:
+                display_recipe(recipe)
+            else:
+                print(f"Recipe with ID {recipe_id} not found.")
     
     elif args.command == "edit":
         #convert value on field type
-        value = args.value
-        if args.field in ["name"]:
-            value = " ".join(args.value)
-        elif args.field in ["ingredients", "instructions", "tags"]:
-            value = args.value
-        elif args.field in ["prep_time", "cook_time", "servings"]:
-            try:
-                value = int(args.value[0])
-            except ValueError:
-                print(f"Error: {args.field} must be a number")
-                return
+        try:
+            value = _EDIT_COERCE[args.field](args.value)
+        except ValueError:
+            print(f"Error: {args.field} must be a number")
+            return
         
-        manager.edit_recipe(args.id, args.field, value)
+        RecipeManager(pretty=args.pretty).edit_recipe(args.id, args.field, value)
     
     elif args.command == "delete":
         confirm = input(f"Are you sure you want to delete recipe #{args.id}? (y/n): ")
         if confirm.lower() == 'y':
-            manager.delete_recipe(args.id)
+            RecipeManager(pretty=args.pretty).delete_recipe(args.id)
     
     elif args.command == "search":
-        results = manager.search_recipes(args.query)
+        results = RecipeManager(readonly=True).search_recipes(args.query)
         if results:
             print(f"Found {len(results)} matching recipes:")
-            for recipe in results:
-                display_recipe(recipe)
+            sys.stdout.write("".join(format_recipe(recipe) for recipe in results))
         else:
             print(f"No recipes found matching '{args.query}'")
     